@@ -1,9 +1,5 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import numpy as np
-from utils import calculate_steam_price, perform_sensitivity_analysis
+from cached import cached_steam_price, cached_sensitivity_sweeps
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +8,94 @@ st.set_page_config(
     layout="wide"
 )
 
+# Chart builders, here and on the pages, cache figures as shared resources keyed
+# on the plotted data, so reruns with unchanged inputs reuse the already-built
+# figure. The caches are bounded so a long-running server doesn't keep a figure
+# for every input ever seen. plotly is imported inside the builders so its import
+# cost is only paid on a cache miss.
+@st.cache_resource(max_entries=32)
+def make_waterfall_chart(labels, values):
+    """Waterfall of the steam price components building up to the net price."""
+    import plotly.graph_objects as go
+    
+    # Build from a single figure spec, so plotly validates it in one pass
+    fig = go.Figure({
+        "data": [{
+            "type": "waterfall",
+            "name": "Steam Price Components",
+            "orientation": "v",
+            "measure": ["relative", "relative", "relative", "total"],
+            "x": list(labels),
+            "y": list(values),
+            "connector": {"line": {"color": "rgb(63, 63, 63)"}},
+            "increasing": {"marker": {"color": "#FF9900"}},
+            "decreasing": {"marker": {"color": "#36A2EB"}},
+            "totals": {"marker": {"color": "#4BC0C0"}}
+        }],
+        "layout": {
+            "title": {"text": "Steam Price Waterfall Chart"},
+            "showlegend": False,
+            "height": 400,
+            "yaxis": {
+                "title": {"text": "$/MMBtu"},
+                "gridcolor": 'rgba(220, 220, 220, 0.6)',
+            },
+            "xaxis": {
+                "title": {"text": "Components"},
+                "gridcolor": 'rgba(220, 220, 220, 0.6)',
+            },
+            "plot_bgcolor": 'rgba(0, 0, 0, 0)',
+            "margin": {"t": 50, "b": 50, "l": 50, "r": 50},
+        }
+    })
+    
+    return fig
+
+@st.cache_resource(max_entries=32)
+def make_sensitivity_chart(param_values, steam_prices, sensitivity_param, x_label, current_value, current_y):
+    """Steam price vs. the swept parameter, with the current input marked."""
+    import plotly.express as px
+    
+    # Plot prices to the cent, as displayed elsewhere
+    steam_prices = [round(steam_price, 2) for steam_price in steam_prices]
+    current_y = round(current_y, 2)
+    
+    fig_sensitivity = px.line(
+        {"param_value": list(param_values), "steam_price": steam_prices},
+        x="param_value",
+        y="steam_price",
+        labels={
+            "param_value": x_label,
+            "steam_price": "Steam Price ($/MMBtu)"
+        },
+        title=f"Sensitivity of Steam Price to {sensitivity_param}"
+    )
+    
+    fig_sensitivity.add_scatter(
+        x=[current_value],
+        y=[current_y],
+        mode="markers",
+        marker=dict(color="red", size=10),
+        name="Current Value",
+        hoverinfo="text",
+        text=f"Current: ({current_value:.2f}, ${current_y:.2f})"
+    )
+    
+    fig_sensitivity.update_layout(
+        height=400,
+        yaxis=dict(
+            title="Steam Price ($/MMBtu)",
+            gridcolor='rgba(220, 220, 220, 0.6)',
+        ),
+        xaxis=dict(
+            gridcolor='rgba(220, 220, 220, 0.6)',
+        ),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        margin=dict(t=50, b=50, l=50, r=50),
+    )
+    
+    return fig_sensitivity
+
 # Title and introduction
 st.title("♨️ Steam Price Calculator")
 st.markdown("""
@@ -24,70 +108,74 @@ boiler efficiency, Low Carbon Fuel Standard (LCFS) credits, and emissions factor
 # Create sidebar for inputs
 st.sidebar.header("Input Parameters")
 
-# Natural gas price input
-ng_price_per_mmbtu = st.sidebar.number_input(
-    "Natural Gas Price ($/MMBtu)",
-    min_value=0.0,
-    max_value=50.0,
-    value=4.0,
-    step=0.1,
-    help="The cost of natural gas per MMBtu (Million British Thermal Units)"
-)
+# Batch input edits in a form so the app only reruns when they are submitted
+with st.sidebar.form("inputs"):
+    # Natural gas price input
+    ng_price_per_mmbtu = st.number_input(
+        "Natural Gas Price ($/MMBtu)",
+        min_value=0.0,
+        max_value=50.0,
+        value=4.0,
+        step=0.1,
+        help="The cost of natural gas per MMBtu (Million British Thermal Units)"
+    )
 
-# Boiler efficiency input
-boiler_efficiency = st.sidebar.slider(
-    "Boiler Efficiency",
-    min_value=0.50,
-    max_value=0.99,
-    value=0.85,
-    step=0.01,
-    help="The thermal efficiency of the boiler (ratio of heat transferred to steam vs. fuel energy input)"
-)
+    # Boiler efficiency input
+    boiler_efficiency = st.slider(
+        "Boiler Efficiency",
+        min_value=0.50,
+        max_value=0.99,
+        value=0.85,
+        step=0.01,
+        help="The thermal efficiency of the boiler (ratio of heat transferred to steam vs. fuel energy input)"
+    )
 
-# LCFS price input
-lcfs_price_per_ton = st.sidebar.number_input(
-    "LCFS Price ($/ton CO₂e)",
-    min_value=0.0,
-    max_value=1000.0,
-    value=100.0,
-    step=5.0,
-    help="The price of Low Carbon Fuel Standard credits per metric ton of CO₂ equivalent"
-)
+    # LCFS price input
+    lcfs_price_per_ton = st.number_input(
+        "LCFS Price ($/ton CO₂e)",
+        min_value=0.0,
+        max_value=1000.0,
+        value=100.0,
+        step=5.0,
+        help="The price of Low Carbon Fuel Standard credits per metric ton of CO₂ equivalent"
+    )
 
-# Emissions factors
-st.sidebar.subheader("Emissions Factors")
-bau_emissions_factor = st.sidebar.number_input(
-    "Business-as-usual Emissions (ton CO₂e/MMBtu)",
-    min_value=0.0,
-    max_value=1.0,
-    value=0.053,
-    step=0.001,
-    format="%.4f",
-    help="Business-as-usual emissions factor in metric tons of CO₂ equivalent per MMBtu"
-)
+    # Emissions factors
+    st.subheader("Emissions Factors")
+    bau_emissions_factor = st.number_input(
+        "Business-as-usual Emissions (ton CO₂e/MMBtu)",
+        min_value=0.0,
+        max_value=1.0,
+        value=0.053,
+        step=0.001,
+        format="%.4f",
+        help="Business-as-usual emissions factor in metric tons of CO₂ equivalent per MMBtu"
+    )
 
-project_emissions_factor = st.sidebar.number_input(
-    "Project Emissions (ton CO₂e/MMBtu)",
-    min_value=0.0,
-    max_value=1.0,
-    value=0.0053,
-    step=0.0001,
-    format="%.4f",
-    help="Project emissions factor in metric tons of CO₂ equivalent per MMBtu"
-)
+    project_emissions_factor = st.number_input(
+        "Project Emissions (ton CO₂e/MMBtu)",
+        min_value=0.0,
+        max_value=1.0,
+        value=0.0053,
+        step=0.0001,
+        format="%.4f",
+        help="Project emissions factor in metric tons of CO₂ equivalent per MMBtu"
+    )
 
-# O&M cost input
-o_and_m_cost = st.sidebar.number_input(
-    "O&M Cost ($/MMBtu)",
-    min_value=0.0,
-    max_value=10.0,
-    value=0.5,
-    step=0.1,
-    help="Operations and Maintenance costs per MMBtu of steam produced"
-)
+    # O&M cost input
+    o_and_m_cost = st.number_input(
+        "O&M Cost ($/MMBtu)",
+        min_value=0.0,
+        max_value=10.0,
+        value=0.5,
+        step=0.1,
+        help="Operations and Maintenance costs per MMBtu of steam produced"
+    )
+    
+    st.form_submit_button("Calculate")
 
 # Calculate steam price
-result = calculate_steam_price(
+result = cached_steam_price(
     ng_price_per_mmbtu=ng_price_per_mmbtu,
     boiler_efficiency=boiler_efficiency,
     lcfs_price_per_ton=lcfs_price_per_ton,
@@ -138,65 +226,66 @@ with col1:
     show_original_units = st.checkbox("Show values in original units", value=False)
     
     if show_original_units:
-        # Create a DataFrame with original units
-        calc_df = pd.DataFrame([
-            {"Component": "Natural Gas Price", "Value": f"${ng_price_per_mmbtu:.2f}/MMBtu", "Original Unit": "$/MMBtu"},
-            {"Component": "Boiler Efficiency", "Value": f"{boiler_efficiency:.2f}", "Original Unit": "Decimal (0-1)"},
-            {"Component": "LCFS Price", "Value": f"${lcfs_price_per_ton:.2f}/ton CO₂e", "Original Unit": "$/ton CO₂e"},
-            {"Component": "Business-as-usual Emissions", "Value": f"{bau_emissions_factor:.4f}", "Original Unit": "ton CO₂e/MMBtu"},
-            {"Component": "Project Emissions", "Value": f"{project_emissions_factor:.4f}", "Original Unit": "ton CO₂e/MMBtu"},
-            {"Component": "O&M Cost", "Value": f"${o_and_m_cost:.2f}/MMBtu", "Original Unit": "$/MMBtu"},
-            {"Component": "Required Natural Gas", "Value": f"{result['required_ng_per_mmbtu_steam']:.4f}", "Original Unit": "MMBtu gas/MMBtu steam"},
-            {"Component": "Emissions Avoided", "Value": f"{emissions_avoided:.4f}", "Original Unit": "ton CO₂e/MMBtu"}
-        ])
-        st.dataframe(calc_df)
+        # Build the table column-wise with original units
+        calc_table = {
+            "Component": [
+                "Natural Gas Price",
+                "Boiler Efficiency",
+                "LCFS Price",
+                "Business-as-usual Emissions",
+                "Project Emissions",
+                "O&M Cost",
+                "Required Natural Gas",
+                "Emissions Avoided"
+            ],
+            "Value": [
+                f"${ng_price_per_mmbtu:.2f}/MMBtu",
+                f"{boiler_efficiency:.2f}",
+                f"${lcfs_price_per_ton:.2f}/ton CO₂e",
+                f"{bau_emissions_factor:.4f}",
+                f"{project_emissions_factor:.4f}",
+                f"${o_and_m_cost:.2f}/MMBtu",
+                f"{result['required_ng_per_mmbtu_steam']:.4f}",
+                f"{emissions_avoided:.4f}"
+            ],
+            "Original Unit": [
+                "$/MMBtu",
+                "Decimal (0-1)",
+                "$/ton CO₂e",
+                "ton CO₂e/MMBtu",
+                "ton CO₂e/MMBtu",
+                "$/MMBtu",
+                "MMBtu gas/MMBtu steam",
+                "ton CO₂e/MMBtu"
+            ]
+        }
+        st.dataframe(calc_table)
     
-    # Always show calculation steps
-    calc_steps_df = pd.DataFrame([
-        {"Component": "Fuel Cost", "Value": f"${fuel_cost:.2f}/MMBtu", "Description": f"Natural gas price (${ng_price_per_mmbtu:.2f}/MMBtu) ÷ boiler efficiency ({boiler_efficiency:.2f})"},
-        {"Component": "LCFS Credit", "Value": f"-${lcfs_credit:.2f}/MMBtu", "Description": f"Emissions avoided ({emissions_avoided:.4f} tons/MMBtu) × LCFS price (${lcfs_price_per_ton:.2f}/ton)"},
-        {"Component": "O&M Cost", "Value": f"${o_and_m_cost:.2f}/MMBtu", "Description": "Operations and maintenance costs"},
-        {"Component": "Net Steam Price", "Value": f"${net_steam_price:.2f}/MMBtu", "Description": "Fuel cost - LCFS credit + O&M cost"}
-    ])
+    # Always show calculation steps, rendered as a markdown table
+    calc_steps_rows = [
+        ("Fuel Cost", f"${fuel_cost:.2f}/MMBtu", f"Natural gas price (${ng_price_per_mmbtu:.2f}/MMBtu) ÷ boiler efficiency ({boiler_efficiency:.2f})"),
+        ("LCFS Credit", f"-${lcfs_credit:.2f}/MMBtu", f"Emissions avoided ({emissions_avoided:.4f} tons/MMBtu) × LCFS price (${lcfs_price_per_ton:.2f}/ton)"),
+        ("O&M Cost", f"${o_and_m_cost:.2f}/MMBtu", "Operations and maintenance costs"),
+        ("Net Steam Price", f"${net_steam_price:.2f}/MMBtu", "Fuel cost - LCFS credit + O&M cost")
+    ]
+    calc_steps_md = "| Component | Value | Description |\n|---|---|---|\n" + "\n".join(
+        f"| {component} | {value} | {description} |" for component, value, description in calc_steps_rows
+    )
     
-    st.table(calc_steps_df)
+    # Escape dollar signs so Streamlit doesn't render them as LaTeX
+    st.markdown(calc_steps_md.replace("$", "\\$"))
     
     # Cost Breakdown Chart
     st.subheader("Cost Breakdown")
     
     # Prepare data for chart
     labels = ['Fuel Cost', 'LCFS Credit (Savings)', 'O&M Cost', 'Net Price']
-    values = [fuel_cost, -lcfs_credit, o_and_m_cost, net_steam_price]
+    # Rounded to cents for display, as the result is unrounded
+    values = [round(fuel_cost, 2), round(-lcfs_credit, 2), o_and_m_cost, round(net_steam_price, 2)]
     colors = ['#FF9900', '#36A2EB', '#FFCE56', '#4BC0C0']
     
     # Create waterfall chart
-    fig = go.Figure(go.Waterfall(
-        name="Steam Price Components",
-        orientation="v",
-        measure=["relative", "relative", "relative", "total"],
-        x=labels,
-        y=values,
-        connector={"line": {"color": "rgb(63, 63, 63)"}},
-        increasing={"marker": {"color": "#FF9900"}},
-        decreasing={"marker": {"color": "#36A2EB"}},
-        totals={"marker": {"color": "#4BC0C0"}}
-    ))
-    
-    fig.update_layout(
-        title="Steam Price Waterfall Chart",
-        showlegend=False,
-        height=400,
-        yaxis=dict(
-            title="$/MMBtu",
-            gridcolor='rgba(220, 220, 220, 0.6)',
-        ),
-        xaxis=dict(
-            title="Components",
-            gridcolor='rgba(220, 220, 220, 0.6)',
-        ),
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        margin=dict(t=50, b=50, l=50, r=50),
-    )
+    fig = make_waterfall_chart(tuple(labels), tuple(values))
     
     st.plotly_chart(fig, use_container_width=True)
 
@@ -219,47 +308,29 @@ with col2:
         "O&M Cost": "o_and_m_cost"
     }
     
-    # Set range for sensitivity analysis
+    # Axis label for the selected parameter
     if sensitivity_param == "Natural Gas Price":
-        param_range = np.linspace(ng_price_per_mmbtu * 0.5, ng_price_per_mmbtu * 1.5, 11)
         x_label = "Natural Gas Price ($/MMBtu)"
     elif sensitivity_param == "Boiler Efficiency":
-        param_range = np.linspace(max(0.5, boiler_efficiency * 0.8), min(0.99, boiler_efficiency * 1.2), 11)
         x_label = "Boiler Efficiency"
     elif sensitivity_param == "LCFS Price":
-        param_range = np.linspace(max(0, lcfs_price_per_ton * 0.5), lcfs_price_per_ton * 1.5, 11)
         x_label = "LCFS Price ($/ton CO₂e)"
     else:  # O&M Cost
-        param_range = np.linspace(max(0, o_and_m_cost * 0.5), o_and_m_cost * 1.5, 11)
         x_label = "O&M Cost ($/MMBtu)"
     
-    # Run sensitivity analysis
-    sensitivity_results = perform_sensitivity_analysis(
-        param_name=param_map[sensitivity_param],
-        param_range=param_range,
-        fixed_params={
-            "ng_price_per_mmbtu": ng_price_per_mmbtu,
-            "boiler_efficiency": boiler_efficiency,
-            "lcfs_price_per_ton": lcfs_price_per_ton,
-            "bau_emissions_factor": bau_emissions_factor,
-            "project_emissions_factor": project_emissions_factor,
-            "o_and_m_cost": o_and_m_cost
-        }
-    )
-    
-    # Create sensitivity chart
-    fig_sensitivity = px.line(
-        sensitivity_results,
-        x="param_value",
-        y="steam_price",
-        labels={
-            "param_value": x_label,
-            "steam_price": "Steam Price ($/MMBtu)"
-        },
-        title=f"Sensitivity of Steam Price to {sensitivity_param}"
+    # Run sensitivity analysis for all parameters at once; the result is cached on the
+    # inputs, so switching the selected parameter reuses the precomputed sweeps
+    sensitivity_sweeps = cached_sensitivity_sweeps(
+        ng_price_per_mmbtu=ng_price_per_mmbtu,
+        boiler_efficiency=boiler_efficiency,
+        lcfs_price_per_ton=lcfs_price_per_ton,
+        bau_emissions_factor=bau_emissions_factor,
+        project_emissions_factor=project_emissions_factor,
+        o_and_m_cost=o_and_m_cost
     )
+    sensitivity_results = sensitivity_sweeps[param_map[sensitivity_param]]
     
-    # Add current value indicator
+    # Current value of the selected parameter, marked on the chart
     if sensitivity_param == "Natural Gas Price":
         current_value = ng_price_per_mmbtu
     elif sensitivity_param == "Boiler Efficiency":
@@ -272,27 +343,14 @@ with col2:
     # Get y-value at current x-value (approximate)
     current_y = net_steam_price
     
-    fig_sensitivity.add_scatter(
-        x=[current_value],
-        y=[current_y],
-        mode="markers",
-        marker=dict(color="red", size=10),
-        name="Current Value",
-        hoverinfo="text",
-        text=f"Current: ({current_value:.2f}, ${current_y:.2f})"
-    )
-    
-    fig_sensitivity.update_layout(
-        height=400,
-        yaxis=dict(
-            title="Steam Price ($/MMBtu)",
-            gridcolor='rgba(220, 220, 220, 0.6)',
-        ),
-        xaxis=dict(
-            gridcolor='rgba(220, 220, 220, 0.6)',
-        ),
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        margin=dict(t=50, b=50, l=50, r=50),
+    # Create sensitivity chart
+    fig_sensitivity = make_sensitivity_chart(
+        tuple(sensitivity_results["param_value"]),
+        tuple(sensitivity_results["steam_price"]),
+        sensitivity_param,
+        x_label,
+        current_value,
+        current_y
     )
     
     st.plotly_chart(fig_sensitivity, use_container_width=True)
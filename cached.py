@@ -0,0 +1,70 @@
+# Streamlit-cached wrappers around the calculations in utils, shared by the app
+# pages. Kept out of utils so it stays importable without a Streamlit runtime.
+import streamlit as st
+from utils import (
+    SENSITIVITY_PARAMS,
+    calculate_steam_price,
+    perform_sensitivity_analyses,
+    sensitivity_range
+)
+
+@st.cache_data(show_spinner=False)
+def cached_steam_price(
+    ng_price_per_mmbtu,
+    boiler_efficiency,
+    lcfs_price_per_ton,
+    bau_emissions_factor,
+    project_emissions_factor,
+    o_and_m_cost,
+    return_components=False
+):
+    """
+    Memoized calculate_steam_price for Streamlit reruns.
+    
+    Results are cached on the scalar inputs, so widget changes that do not
+    touch them skip the calculation entirely.
+    """
+    return calculate_steam_price(
+        ng_price_per_mmbtu=ng_price_per_mmbtu,
+        boiler_efficiency=boiler_efficiency,
+        lcfs_price_per_ton=lcfs_price_per_ton,
+        bau_emissions_factor=bau_emissions_factor,
+        project_emissions_factor=project_emissions_factor,
+        o_and_m_cost=o_and_m_cost,
+        return_components=return_components
+    )
+
+@st.cache_data(show_spinner=False)
+def cached_sensitivity_sweeps(
+    ng_price_per_mmbtu,
+    boiler_efficiency,
+    lcfs_price_per_ton,
+    bau_emissions_factor,
+    project_emissions_factor,
+    o_and_m_cost
+):
+    """
+    Memoized sensitivity analysis of every parameter in SENSITIVITY_PARAMS.
+    
+    All sweeps are computed together and cached on the fixed inputs, so
+    switching between parameters in the UI never triggers a recomputation.
+    
+    Returns:
+        dict: Parameter name mapped to its sensitivity analysis result
+    """
+    fixed_params = {
+        "ng_price_per_mmbtu": ng_price_per_mmbtu,
+        "boiler_efficiency": boiler_efficiency,
+        "lcfs_price_per_ton": lcfs_price_per_ton,
+        "bau_emissions_factor": bau_emissions_factor,
+        "project_emissions_factor": project_emissions_factor,
+        "o_and_m_cost": o_and_m_cost
+    }
+    
+    return perform_sensitivity_analyses(
+        {
+            param_name: sensitivity_range(param_name, fixed_params[param_name])
+            for param_name in SENSITIVITY_PARAMS
+        },
+        fixed_params
+    )
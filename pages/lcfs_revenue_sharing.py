@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
-import numpy_financial as npf
-from utils import calculate_steam_price
+from cached import cached_steam_price
+from utils import annuity_irr, annuity_npv, annuity_payback
 
 # Page configuration
 st.set_page_config(
@@ -13,6 +12,103 @@ st.set_page_config(
     layout="wide"
 )
 
+# Offtaker revenue shares swept for the IRR sensitivity, from 0% to 100% in 5% increments
+REVENUE_SHARES = np.linspace(0, 1, 21)
+
+@st.cache_data(show_spinner=False)
+def _sweep_irr_npv(capital_investment, annual_lcfs_revenue, project_lifetime, discount_rate, target_irr):
+    """
+    Antora IRR and NPV for offtaker revenue shares from 0% to 100% in 5% increments.
+    
+    Cached on its inputs, so reruns from widgets that don't affect the sweep
+    (such as the offtaker share slider) skip the IRR root-finding.
+    
+    Returns:
+        tuple: (irrs in %, npvs, first share meeting the target IRR or None), with
+            irrs and npvs aligned to REVENUE_SHARES
+    """
+    antora_revs = annual_lcfs_revenue * (1 - REVENUE_SHARES)
+    
+    # Constant annual revenue makes Antora's cash flows an annuity, so NPV has a
+    # closed form and IRR is a single scalar root find per share
+    npvs = annuity_npv(capital_investment, antora_revs, discount_rate, project_lifetime)
+    irrs = np.array([annuity_irr(capital_investment, antora_rev, project_lifetime) for antora_rev in antora_revs])
+    
+    # Find first revenue share that meets target IRR
+    meets_target = irrs >= target_irr
+    optimal_share_found = float(REVENUE_SHARES[meets_target.argmax()]) if meets_target.any() else None
+    
+    irrs = irrs * 100  # Convert to percentage
+    
+    return irrs, npvs, optimal_share_found
+
+@st.cache_resource(max_entries=32)
+def make_revenue_pie_chart(offtaker_share_pct, offtaker_revenue, antora_revenue):
+    """Donut chart of the annual LCFS revenue split between offtaker and Antora."""
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=[f'Offtaker ({offtaker_share_pct*100:.0f}%)', 
+                f'Antora ({(1-offtaker_share_pct)*100:.0f}%)'],
+        values=[offtaker_revenue, antora_revenue],
+        hole=.4,
+        marker_colors=['#4BC0C0', '#FF9900']
+    )])
+    
+    fig_pie.update_layout(
+        title="Annual LCFS Revenue Distribution",
+        height=400,
+        margin=dict(t=50, b=50, l=50, r=50),
+    )
+    
+    return fig_pie
+
+@st.cache_resource(max_entries=32)
+def make_irr_sensitivity_chart(offtaker_shares, antora_irrs, target_irr, current_share_pct):
+    """Antora IRR vs. offtaker revenue share, with the target IRR and current share marked."""
+    fig_irr = go.Figure(go.Scatter(
+        x=list(offtaker_shares),
+        y=list(antora_irrs),
+        mode="lines",
+        hovertemplate="Offtaker Revenue Share (%)=%{x}<br>Antora IRR (%)=%{y}<extra></extra>"
+    ))
+    
+    fig_irr.update_layout(
+        title="Antora IRR vs. Revenue Share",
+        xaxis_title="Offtaker Revenue Share (%)"
+    )
+    
+    # Add target IRR line
+    fig_irr.add_hline(
+        y=target_irr * 100,
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Target IRR",
+        annotation_position="bottom right"
+    )
+    
+    # Add current value indicator
+    fig_irr.add_vline(
+        x=current_share_pct * 100,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text="Current",
+        annotation_position="top right"
+    )
+    
+    fig_irr.update_layout(
+        height=300,
+        yaxis=dict(
+            title="IRR (%)",
+            gridcolor='rgba(220, 220, 220, 0.6)',
+        ),
+        xaxis=dict(
+            gridcolor='rgba(220, 220, 220, 0.6)',
+        ),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        margin=dict(t=50, b=50, l=50, r=50)
+    )
+    
+    return fig_irr
+
 # Title and introduction
 st.title("💸 Low-Carbon Revenue Sharing Calculator")
 st.markdown("""
@@ -132,7 +228,7 @@ with st.sidebar.expander("Project Financials", expanded=True):
 
 # Calculate the required LCFS credit price to achieve target price
 # First calculate steam price without LCFS
-steam_price_no_lcfs = calculate_steam_price(
+steam_price_no_lcfs = cached_steam_price(
     ng_price_per_mmbtu=ng_price_per_mmbtu,
     boiler_efficiency=boiler_efficiency,
     lcfs_price_per_ton=0,  # No LCFS credits
@@ -155,24 +251,10 @@ if emissions_avoided > 0:
 # Calculate annual LCFS revenue
 annual_lcfs_revenue = required_lcfs_value_per_mmbtu * annual_steam_usage
 
-# Calculate sensitivity analysis to determine optimal revenue split
-revenue_shares_calc = np.linspace(0, 1, 21)  # 0% to 100% in 5% increments
-irrs_calc = []
-optimal_share_found = None
-
-for share in revenue_shares_calc:
-    antora_rev = annual_lcfs_revenue * (1 - share)
-    cfs = [-capital_investment]
-    for year in range(1, project_lifetime + 1):
-        cfs.append(antora_rev)
-    
-    try:
-        irr_val = npf.irr(cfs)
-        # Find first revenue share that meets target IRR
-        if irr_val >= target_irr and optimal_share_found is None:
-            optimal_share_found = share
-    except:
-        pass
+# Calculate sensitivity analysis to determine optimal revenue split (also plotted below)
+irrs, npvs, optimal_share_found = _sweep_irr_npv(
+    capital_investment, annual_lcfs_revenue, project_lifetime, discount_rate, target_irr
+)
 
 # Set default value based on optimal sharing to achieve target IRR
 default_revenue_share = 0.5  # Default to 50% if no optimal found
@@ -201,35 +283,17 @@ else:
 offtaker_annual_revenue = annual_lcfs_revenue * revenue_share_offtaker_pct
 antora_annual_revenue = annual_lcfs_revenue * (1 - revenue_share_offtaker_pct)
 
-# Calculate financial metrics for Antora
-antora_cash_flows = [-capital_investment]  # Initial investment (year 0)
-for year in range(1, project_lifetime + 1):
-    antora_cash_flows.append(antora_annual_revenue)  # Annual revenue
-
-# Calculate NPV and IRR
-antora_npv = npf.npv(discount_rate, antora_cash_flows)
-try:
-    antora_irr = npf.irr(antora_cash_flows)
-except:
-    antora_irr = None  # IRR may not exist in some cases
+# Calculate financial metrics for Antora; its cash flows are an annuity of
+# antora_annual_revenue after the initial investment, so NPV and IRR are closed form
+antora_npv = annuity_npv(capital_investment, antora_annual_revenue, discount_rate, project_lifetime)
+antora_irr = annuity_irr(capital_investment, antora_annual_revenue, project_lifetime)  # nan if no IRR exists
 
 # Payback period (simple)
-cumulative_antora_cf = np.cumsum(antora_cash_flows)
-payback_years = None
-for i, cf in enumerate(cumulative_antora_cf):
-    if cf >= 0:
-        # Interpolate for partial year
-        if i > 0:
-            prev_cf = cumulative_antora_cf[i-1]
-            fraction = -prev_cf / (cf - prev_cf)
-            payback_years = i - 1 + fraction
-        else:
-            payback_years = i
-        break
+payback_years = annuity_payback(capital_investment, antora_annual_revenue, project_lifetime)
 
 # Check if target IRR is achieved
-irr_gap = (antora_irr - target_irr) * 100 if antora_irr is not None else None
-irr_achieved = antora_irr >= target_irr if antora_irr is not None else False
+irr_gap = (antora_irr - target_irr) * 100 if not np.isnan(antora_irr) else None
+irr_achieved = antora_irr >= target_irr if not np.isnan(antora_irr) else False
 
 # Main content layout - create two columns
 col1, col2 = st.columns([3, 2])
@@ -262,23 +326,35 @@ with col1:
     # Calculation explanation
     st.subheader("Calculation Breakdown")
     
-    # Create a DataFrame for the calculation steps
-    calc_df = pd.DataFrame([
-        {"Component": "Steam Price without LCFS", "Value": f"${steam_price_no_lcfs:.2f}/MMBtu", 
-         "Description": "Base steam price without carbon credits"},
-        {"Component": "Target Steam Price", "Value": f"${target_steam_price:.2f}/MMBtu", 
-         "Description": "Competitive target price for offtaker"},
-        {"Component": "Price Gap to Fill", "Value": f"${price_gap:.2f}/MMBtu", 
-         "Description": "Additional value needed from carbon credits"},
-        {"Component": "Required LCFS Value", "Value": f"${required_lcfs_value_per_mmbtu:.2f}/MMBtu", 
-         "Description": "Carbon credit value needed per MMBtu of steam"},
-        {"Component": "Emissions Avoided", "Value": f"{emissions_avoided:.4f} ton/MMBtu", 
-         "Description": "CO₂e emissions reduction per MMBtu"},
-        {"Component": "Required LCFS Price", "Value": f"${required_lcfs_price_per_ton:.2f}/ton CO₂e", 
-         "Description": "Required carbon credit price"}
-    ])
-    
-    st.table(calc_df)
+    # Build the calculation steps table column-wise
+    calc_table = {
+        "Component": [
+            "Steam Price without LCFS",
+            "Target Steam Price",
+            "Price Gap to Fill",
+            "Required LCFS Value",
+            "Emissions Avoided",
+            "Required LCFS Price"
+        ],
+        "Value": [
+            f"${steam_price_no_lcfs:.2f}/MMBtu",
+            f"${target_steam_price:.2f}/MMBtu",
+            f"${price_gap:.2f}/MMBtu",
+            f"${required_lcfs_value_per_mmbtu:.2f}/MMBtu",
+            f"{emissions_avoided:.4f} ton/MMBtu",
+            f"${required_lcfs_price_per_ton:.2f}/ton CO₂e"
+        ],
+        "Description": [
+            "Base steam price without carbon credits",
+            "Competitive target price for offtaker",
+            "Additional value needed from carbon credits",
+            "Carbon credit value needed per MMBtu of steam",
+            "CO₂e emissions reduction per MMBtu",
+            "Required carbon credit price"
+        ]
+    }
+    
+    st.table(calc_table)
     
     # Revenue Sharing
     st.header("Revenue Sharing Results")
@@ -299,19 +375,7 @@ with col1:
         )
     
     # Pie chart for revenue distribution
-    fig_pie = go.Figure(data=[go.Pie(
-        labels=[f'Offtaker ({revenue_share_offtaker_pct*100:.0f}%)', 
-                f'Antora ({(1-revenue_share_offtaker_pct)*100:.0f}%)'],
-        values=[offtaker_annual_revenue, antora_annual_revenue],
-        hole=.4,
-        marker_colors=['#4BC0C0', '#FF9900']
-    )])
-    
-    fig_pie.update_layout(
-        title="Annual LCFS Revenue Distribution",
-        height=400,
-        margin=dict(t=50, b=50, l=50, r=50),
-    )
+    fig_pie = make_revenue_pie_chart(revenue_share_offtaker_pct, offtaker_annual_revenue, antora_annual_revenue)
     
     st.plotly_chart(fig_pie, use_container_width=True)
 
@@ -337,7 +401,7 @@ with col2:
     with fin2:
         st.metric(
             label="Antora IRR",
-            value=f"{antora_irr*100:.2f}%" if antora_irr is not None else "N/A",
+            value=f"{antora_irr*100:.2f}%" if not np.isnan(antora_irr) else "N/A",
             delta=f"{irr_gap:.2f}%" if irr_gap is not None else None,
             delta_color="normal"
         )
@@ -351,94 +415,30 @@ with col2:
     # Revenue Share Optimization
     st.subheader("Revenue Share Optimization")
     
-    # Calculate optimal revenue share for target IRR
-    if antora_irr is not None:
-        # Run sensitivity analysis on revenue share percentage
-        revenue_shares = np.linspace(0, 1, 21)  # 0% to 100% in 5% increments
-        irrs = []
-        npvs = []
-        
-        for share in revenue_shares:
-            antora_rev = annual_lcfs_revenue * (1 - share)
-            cfs = [-capital_investment]
-            for year in range(1, project_lifetime + 1):
-                cfs.append(antora_rev)
-            
-            try:
-                irr_val = npf.irr(cfs)
-                irrs.append(irr_val * 100)  # Convert to percentage
-            except:
-                irrs.append(None)
-            
-            npv_val = npf.npv(discount_rate, cfs)
-            npvs.append(npv_val)
-        
-        # Find optimal revenue share
-        optimal_share = None
-        for i, (share, irr_val) in enumerate(zip(revenue_shares, irrs)):
-            if irr_val is not None and irr_val >= target_irr * 100:
-                optimal_share = share
-                break
-        
-        # Create sensitivity chart
-        sensitivity_data = pd.DataFrame({
-            "offtaker_share": [s * 100 for s in revenue_shares],  # Convert to percentages for display
-            "antora_irr": irrs,
-            "antora_npv": npvs
-        }).dropna()
+    # Create sensitivity chart
+    sensitivity_data = pd.DataFrame({
+        "offtaker_share": REVENUE_SHARES * 100,  # Convert to percentages for display
+        "antora_irr": irrs,
+        "antora_npv": npvs
+    }).dropna()
+    
+    if not sensitivity_data.empty:
+        # IRR sensitivity chart
+        fig_irr = make_irr_sensitivity_chart(
+            tuple(sensitivity_data["offtaker_share"]),
+            tuple(sensitivity_data["antora_irr"]),
+            target_irr,
+            revenue_share_offtaker_pct
+        )
         
-        if not sensitivity_data.empty:
-            # IRR sensitivity chart
-            fig_irr = px.line(
-                sensitivity_data,
-                x="offtaker_share",
-                y="antora_irr",
-                labels={
-                    "offtaker_share": "Offtaker Revenue Share (%)",
-                    "antora_irr": "Antora IRR (%)"
-                },
-                title="Antora IRR vs. Revenue Share"
-            )
-            
-            # Add target IRR line
-            fig_irr.add_hline(
-                y=target_irr * 100,
-                line_dash="dash",
-                line_color="red",
-                annotation_text="Target IRR",
-                annotation_position="bottom right"
-            )
-            
-            # Add current value indicator
-            fig_irr.add_vline(
-                x=revenue_share_offtaker_pct * 100,
-                line_dash="dash",
-                line_color="gray",
-                annotation_text="Current",
-                annotation_position="top right"
-            )
-            
-            fig_irr.update_layout(
-                height=300,
-                yaxis=dict(
-                    title="IRR (%)",
-                    gridcolor='rgba(220, 220, 220, 0.6)',
-                ),
-                xaxis=dict(
-                    gridcolor='rgba(220, 220, 220, 0.6)',
-                ),
-                plot_bgcolor='rgba(0, 0, 0, 0)',
-                margin=dict(t=50, b=50, l=50, r=50)
-            )
-            
-            st.plotly_chart(fig_irr, use_container_width=True)
-            
-            # Add recommendation
-            if optimal_share is not None:
-                st.info(f"💡 Recommendation: Maximum offtaker share to achieve target IRR: {optimal_share*100:.0f}%")
-            else:
-                st.warning("⚠️ Target IRR cannot be achieved with current parameters.")
+        st.plotly_chart(fig_irr, use_container_width=True)
         
+        # Add recommendation
+        if optimal_share_found is not None:
+            st.info(f"💡 Recommendation: Maximum offtaker share to achieve target IRR: {optimal_share_found*100:.0f}%")
+        else:
+            st.warning("⚠️ Target IRR cannot be achieved with current parameters.")
+    
     # Additional Insights
     st.subheader("Key Insights")
     
@@ -1,8 +1,93 @@
-import pandas as pd
+from functools import lru_cache
+
 import numpy as np
-import numpy_financial as npf
+from numba import njit, prange
+from scipy.optimize import brentq
+
+# Steam price inputs, in the positional order used by the compiled kernels
+STEAM_PRICE_PARAMS = (
+    "ng_price_per_mmbtu",
+    "boiler_efficiency",
+    "lcfs_price_per_ton",
+    "bau_emissions_factor",
+    "project_emissions_factor",
+    "o_and_m_cost"
+)
+PARAM_IDX = {param_name: i for i, param_name in enumerate(STEAM_PRICE_PARAMS)}
+
+# Sweeps with at least this many points are evaluated by the multicore kernel
+PARALLEL_SWEEP_MIN_POINTS = 1000
+
+# Normalized [0, 1] grid scaled onto each default 11-point sensitivity range
+_UNIT_GRID = np.linspace(0.0, 1.0, 11)
+
+# Parameters offered in the sensitivity analysis
+SENSITIVITY_PARAMS = (
+    "ng_price_per_mmbtu",
+    "boiler_efficiency",
+    "lcfs_price_per_ton",
+    "o_and_m_cost"
+)
+
+# Range of IRRs (as decimals) that annuity_irr reports, from -99.9% to 1000%
+IRR_BRACKET = (-0.999, 10.0)
+
+def _steam_price_formula(
+    ng_price_per_mmbtu,
+    boiler_efficiency,
+    lcfs_price_per_ton,
+    bau_emissions_factor,
+    project_emissions_factor,
+    o_and_m_cost
+):
+    """
+    Steam price arithmetic, for scalars or broadcastable arrays alike.
+    
+    Returns:
+        float or numpy.ndarray: Net steam price ($/MMBtu), unrounded
+    """
+    # Fuel cost - LCFS credit on avoided emissions + O&M, as one fused expression
+    # (with fastmath, LLVM can lower the multiply-add chain to FMA instructions)
+    return (
+        ng_price_per_mmbtu / boiler_efficiency
+        - (bau_emissions_factor - project_emissions_factor) * lcfs_price_per_ton
+        + o_and_m_cost
+    )
+
+# Compiled scalar version shared by calculate_steam_price and _sweep. An explicit
+# signature makes numba compile eagerly at import (or load the on-disk cache), so
+# the first interaction with the app doesn't stall on compilation
+_steam_price_core = njit(
+    "float64(float64, float64, float64, float64, float64, float64)", cache=True, fastmath=True
+)(_steam_price_formula)
+
+@lru_cache(maxsize=4096)
+def _steam_price_scalar(
+    ng_price_per_mmbtu,
+    boiler_efficiency,
+    lcfs_price_per_ton,
+    bau_emissions_factor,
+    project_emissions_factor,
+    o_and_m_cost
+):
+    """
+    Memoized compiled steam price, for callers outside Streamlit's cache that
+    repeat the same inputs. Expects native floats so the key hashes cheaply.
+    
+    Returns:
+        float: Net steam price ($/MMBtu), unrounded
+    """
+    return _steam_price_core(
+        ng_price_per_mmbtu,
+        boiler_efficiency,
+        lcfs_price_per_ton,
+        bau_emissions_factor,
+        project_emissions_factor,
+        o_and_m_cost
+    )
 
 def calculate_steam_price(
+    *,
     ng_price_per_mmbtu=4.00,
     boiler_efficiency=0.85,
     lcfs_price_per_ton=100,
@@ -28,32 +113,95 @@ def calculate_steam_price(
         return_components (bool): If True, returns a dictionary with all components
 
     Returns:
-        float or dict: Net steam price ($/MMBtu) or dictionary with price components
+        float or dict: Net steam price ($/MMBtu) or dictionary with price components,
+            unrounded (round or format for display)
     """
-
-    # Step 1: Fuel cost per MMBtu of steam
-    required_ng_per_mmbtu_steam = 1 / boiler_efficiency
-    fuel_cost = ng_price_per_mmbtu * required_ng_per_mmbtu_steam
-
-    # Step 2: Emissions avoided (tons CO₂e per MMBtu)
-    emissions_avoided = bau_emissions_factor - project_emissions_factor
-
-    # Step 3: LCFS credit per MMBtu
-    lcfs_credit = emissions_avoided * lcfs_price_per_ton
-
-    # Step 4: Final steam price
-    net_steam_price = fuel_cost - lcfs_credit + o_and_m_cost
+    net_steam_price = _steam_price_scalar(
+        float(ng_price_per_mmbtu),
+        float(boiler_efficiency),
+        float(lcfs_price_per_ton),
+        float(bau_emissions_factor),
+        float(project_emissions_factor),
+        float(o_and_m_cost)
+    )
     
     if return_components:
+        # The compiled core only returns the total, so break it down here
+        required_ng_per_mmbtu_steam = 1 / boiler_efficiency
+        fuel_cost = ng_price_per_mmbtu * required_ng_per_mmbtu_steam
+        emissions_avoided = bau_emissions_factor - project_emissions_factor
+        lcfs_credit = emissions_avoided * lcfs_price_per_ton
+        
         return {
-            "net_steam_price": round(net_steam_price, 2),
-            "fuel_cost": round(fuel_cost, 2),
-            "lcfs_credit": round(lcfs_credit, 2),
+            "net_steam_price": net_steam_price,
+            "fuel_cost": fuel_cost,
+            "lcfs_credit": lcfs_credit,
             "emissions_avoided": emissions_avoided,
             "required_ng_per_mmbtu_steam": required_ng_per_mmbtu_steam
         }
     
-    return round(net_steam_price, 2)
+    return net_steam_price
+
+def sensitivity_range(param_name, value, num_points=11):
+    """
+    Default range of values to sweep for a parameter in the sensitivity analysis.
+    
+    Args:
+        param_name (str): Name of the parameter to vary
+        value (float): Current value of the parameter
+        num_points (int): Number of points in the range
+    
+    Returns:
+        numpy.ndarray: Range of values centred on the current value
+    """
+    if param_name == "ng_price_per_mmbtu":
+        low, high = value * 0.5, value * 1.5
+    elif param_name == "boiler_efficiency":
+        # Keep efficiency within the physically sensible bounds of the input
+        low, high = max(0.5, value * 0.8), min(0.99, value * 1.2)
+    else:
+        low, high = max(0, value * 0.5), value * 1.5
+    
+    unit_grid = _UNIT_GRID if num_points == _UNIT_GRID.size else np.linspace(0.0, 1.0, num_points)
+    return low + (high - low) * unit_grid
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sweep(
+    param_idx,
+    values,
+    ng_price_per_mmbtu,
+    boiler_efficiency,
+    lcfs_price_per_ton,
+    bau_emissions_factor,
+    project_emissions_factor,
+    o_and_m_cost
+):
+    """
+    Compiled multicore steam price sweep over one parameter.
+    
+    Args:
+        param_idx (int): Position of the swept parameter in STEAM_PRICE_PARAMS
+        values (numpy array): Values of the swept parameter
+        ng_price_per_mmbtu ... o_and_m_cost (float): Fixed parameter values;
+            the one at param_idx is ignored
+    
+    Returns:
+        numpy.ndarray: Unrounded steam price for every value
+    """
+    steam_price = np.empty_like(values)
+    
+    for i in prange(values.size):
+        value = values[i]
+        ng = value if param_idx == 0 else ng_price_per_mmbtu
+        efficiency = value if param_idx == 1 else boiler_efficiency
+        lcfs = value if param_idx == 2 else lcfs_price_per_ton
+        bau = value if param_idx == 3 else bau_emissions_factor
+        project = value if param_idx == 4 else project_emissions_factor
+        o_and_m = value if param_idx == 5 else o_and_m_cost
+        
+        steam_price[i] = _steam_price_core(ng, efficiency, lcfs, bau, project, o_and_m)
+    
+    return steam_price
 
 def perform_sensitivity_analysis(param_name, param_range, fixed_params):
     """
@@ -65,27 +213,57 @@ def perform_sensitivity_analysis(param_name, param_range, fixed_params):
         fixed_params (dict): Dictionary of all parameters with their fixed values
     
     Returns:
-        pandas.DataFrame: DataFrame with parameter values and corresponding steam prices
+        dict: Arrays of parameter values ("param_value") and corresponding unrounded
+            steam prices ("steam_price")
     """
-    results = []
+    param_range = np.asarray(param_range, dtype=float)
     
-    for value in param_range:
-        # Create a copy of fixed parameters
-        params = fixed_params.copy()
-        
-        # Update the parameter to vary
-        params[param_name] = value
-        
-        # Calculate steam price with the updated parameter
-        steam_price = calculate_steam_price(**params)
-        
-        # Store the result
-        results.append({
-            "param_value": value,
-            "steam_price": steam_price
-        })
+    if param_range.size < PARALLEL_SWEEP_MIN_POINTS:
+        return perform_sensitivity_analyses({param_name: param_range}, fixed_params)[param_name]
+    
+    # Spread large sweeps across all cores
+    steam_price = _sweep(
+        PARAM_IDX[param_name],
+        param_range,
+        *(float(fixed_params[name]) for name in STEAM_PRICE_PARAMS)
+    )
+    
+    return {
+        "param_value": param_range,
+        "steam_price": steam_price
+    }
+
+def perform_sensitivity_analyses(param_ranges, fixed_params):
+    """
+    Perform one-at-a-time sensitivity analysis of several parameters in a single pass.
+    
+    The inputs are laid out as a (6, sweeps, points) array holding the fixed
+    values, with each sweep's own parameter row replaced by its range, so
+    every sweep is evaluated by one broadcast expression.
     
-    return pd.DataFrame(results)
+    Args:
+        param_ranges (dict): Parameter names mapped to their ranges of values (all the same length)
+        fixed_params (dict): Dictionary of all parameters with their fixed values
+    
+    Returns:
+        dict: Parameter name mapped to a perform_sensitivity_analysis-style result
+    """
+    param_names = list(param_ranges)
+    ranges = np.array([param_ranges[name] for name in param_names], dtype=float)
+    base = np.array([fixed_params[name] for name in STEAM_PRICE_PARAMS], dtype=float)
+    
+    inputs = np.tile(base[:, None, None], (1,) + ranges.shape)
+    inputs[[PARAM_IDX[name] for name in param_names], np.arange(len(param_names))] = ranges
+    
+    steam_prices = _steam_price_formula(*inputs)
+    
+    return {
+        param_name: {
+            "param_value": ranges[i],
+            "steam_price": steam_prices[i]
+        }
+        for i, param_name in enumerate(param_names)
+    }
 
 def calculate_revenue_sharing(
     steam_price=5.00,
@@ -111,10 +289,12 @@ def calculate_revenue_sharing(
         project_lifetime (int): Expected project lifetime in years
         discount_rate (float): Annual discount rate for NPV calculations (as decimal)
         revenue_share_percentage (float): Percentage of cost savings going to offtaker (as decimal)
-        return_detailed (bool): If True, returns detailed NPV and cash flow information
+        return_detailed (bool): If True, also returns per-year cash flows and present values
+            as a dict of arrays under "cash_flows"
     
     Returns:
-        dict: Results of the revenue sharing analysis
+        dict: Results of the revenue sharing analysis, unrounded; "producer_irr" (%) is
+            nan when no IRR exists
     """
     # Calculate annual cost savings
     annual_cost_savings = (baseline_steam_price - steam_price) * annual_steam_usage
@@ -126,66 +306,160 @@ def calculate_revenue_sharing(
     offtaker_annual_share = annual_cost_savings * revenue_share_percentage
     producer_annual_share = total_annual_benefit - offtaker_annual_share
     
-    # NPV calculations
-    cash_flows = []
-    producer_cash_flows = [-capital_investment]  # Initial investment (year 0)
-    offtaker_cash_flows = [0]  # No initial investment for offtaker
+    # NPV calculations: discount each year's cash flow to present value
+    years = np.arange(1, project_lifetime + 1)
+    pv_factors = (1 + discount_rate) ** -years
+    producer_pvs = producer_annual_share * pv_factors
+    offtaker_pvs = offtaker_annual_share * pv_factors
     
-    for year in range(1, project_lifetime + 1):
-        producer_cf = producer_annual_share
-        offtaker_cf = offtaker_annual_share
-        
-        # Discount to present value
-        pv_factor = 1 / ((1 + discount_rate) ** year)
-        producer_cash_flows.append(producer_cf)
-        offtaker_cash_flows.append(offtaker_cf)
-        
-        cash_flows.append({
-            "year": year,
-            "producer_cash_flow": producer_cf,
-            "offtaker_cash_flow": offtaker_cf,
-            "producer_pv": producer_cf * pv_factor,
-            "offtaker_pv": offtaker_cf * pv_factor
-        })
-    
-    # Calculate NPVs
-    producer_npv = npf.npv(discount_rate, producer_cash_flows)
-    offtaker_npv = npf.npv(discount_rate, offtaker_cash_flows)
-    
-    # Calculate IRR for producer
-    try:
-        producer_irr = npf.irr(producer_cash_flows)
-    except:
-        producer_irr = None  # IRR may not exist in some cases
+    # Calculate NPVs (no initial investment for offtaker)
+    producer_npv = producer_pvs.sum() - capital_investment
+    offtaker_npv = offtaker_pvs.sum()
+    
+    # Calculate IRR for producer; the capital investment followed by the constant
+    # annual share is an annuity, so this is nan rather than an exception if no IRR exists
+    producer_irr = annuity_irr(capital_investment, producer_annual_share, project_lifetime)
     
     # Payback period (simple)
-    cumulative_producer_cf = np.cumsum(producer_cash_flows)
-    payback_years = None
-    for i, cf in enumerate(cumulative_producer_cf):
-        if cf >= 0:
-            # Interpolate for partial year
-            if i > 0:
-                prev_cf = cumulative_producer_cf[i-1]
-                fraction = -prev_cf / (cf - prev_cf)
-                payback_years = i - 1 + fraction
-            else:
-                payback_years = i
-            break
+    payback_years = annuity_payback(capital_investment, producer_annual_share, project_lifetime)
     
     results = {
-        "annual_cost_savings": round(annual_cost_savings, 2),
-        "lcfs_credit_value": round(lcfs_credit_value, 2),
-        "total_annual_benefit": round(total_annual_benefit, 2),
-        "offtaker_annual_share": round(offtaker_annual_share, 2),
-        "producer_annual_share": round(producer_annual_share, 2),
-        "producer_npv": round(producer_npv, 2),
-        "offtaker_npv": round(offtaker_npv, 2),
-        "producer_irr": round(producer_irr * 100, 2) if producer_irr is not None else None,
-        "payback_period": round(payback_years, 2) if payback_years is not None else None,
+        "annual_cost_savings": annual_cost_savings,
+        "lcfs_credit_value": lcfs_credit_value,
+        "total_annual_benefit": total_annual_benefit,
+        "offtaker_annual_share": offtaker_annual_share,
+        "producer_annual_share": producer_annual_share,
+        "producer_npv": producer_npv,
+        "offtaker_npv": offtaker_npv,
+        "producer_irr": producer_irr * 100,
+        "payback_period": payback_years,
         "revenue_share_percentage": revenue_share_percentage * 100  # Convert to percentage
     }
     
     if return_detailed:
-        results["cash_flows"] = cash_flows
+        results["cash_flows"] = {
+            "year": years,
+            "producer_cash_flow": np.full(project_lifetime, producer_annual_share),
+            "offtaker_cash_flow": np.full(project_lifetime, offtaker_annual_share),
+            "producer_pv": producer_pvs,
+            "offtaker_pv": offtaker_pvs
+        }
     
     return results
+
+def annuity_npv(capital_investment, annual_cash_flow, discount_rate, project_lifetime):
+    """
+    Calculate the NPV of an investment that returns a constant annual cash flow.
+    
+    Evaluates the geometric series in closed form, so it gives the same result as
+    npf.npv on [-capital_investment, annual_cash_flow, ...] without building the flows.
+    
+    Args:
+        capital_investment (float): Initial capital investment ($)
+        annual_cash_flow (float or ndarray): Cash flow received at the end of every year ($)
+        discount_rate (float): Annual discount rate as a decimal
+        project_lifetime (int): Number of annual cash flows
+    
+    Returns:
+        float or ndarray: NPV ($), with the same shape as annual_cash_flow
+    """
+    if discount_rate == 0:
+        return -capital_investment + annual_cash_flow * project_lifetime
+    annuity_factor = (1 - (1 + discount_rate) ** -project_lifetime) / discount_rate
+    return -capital_investment + annual_cash_flow * annuity_factor
+
+def annuity_payback(capital_investment, annual_cash_flow, project_lifetime):
+    """
+    Calculate the simple payback period of an investment that returns a constant annual cash flow.
+    
+    The cumulative cash flow grows linearly, so break-even is reached after
+    capital_investment / annual_cash_flow years.
+    
+    Args:
+        capital_investment (float): Initial capital investment ($)
+        annual_cash_flow (float): Cash flow received at the end of every year ($)
+        project_lifetime (int): Number of annual cash flows
+    
+    Returns:
+        float or None: Payback period (years), or None if the investment isn't recovered within the project lifetime
+    """
+    if capital_investment <= 0:
+        return 0
+    if annual_cash_flow > 0 and capital_investment / annual_cash_flow <= project_lifetime:
+        return capital_investment / annual_cash_flow
+    return None
+
+# Compiled eagerly like _steam_price_core, so the revenue page's first rerun doesn't stall
+@njit("float64(float64, float64, int64, float64, int64)", cache=True)
+def _annuity_irr_newton(capital_investment, annual_cash_flow, project_lifetime, tol, maxit):
+    """
+    Compiled Newton iteration for the IRR of a constant annuity.
+    
+    Starts from the perpetuity yield annual_cash_flow / capital_investment and
+    stops once a step is below tol, or gives up after maxit steps.
+    
+    Returns:
+        float: IRR as a decimal, or nan if the iteration doesn't converge
+    """
+    n = project_lifetime
+    rate = annual_cash_flow / capital_investment
+    for _ in range(maxit):
+        if abs(rate) < 1e-6:
+            # The closed form cancels catastrophically near r = 0, so use the series
+            # n - n(n+1)/2 r + n(n+1)(n+2)/6 r^2 of the annuity factor instead
+            npv = annual_cash_flow * (
+                n - n * (n + 1) / 2 * rate + n * (n + 1) * (n + 2) / 6 * rate * rate
+            ) - capital_investment
+            dnpv = annual_cash_flow * (-n * (n + 1) / 2 + n * (n + 1) * (n + 2) / 3 * rate)
+        else:
+            discount = (1 + rate) ** -n
+            npv = annual_cash_flow * (1 - discount) / rate - capital_investment
+            dnpv = annual_cash_flow * (n * discount / (1 + rate) * rate - (1 - discount)) / (rate * rate)
+        if dnpv == 0:
+            return np.nan
+        step = npv / dnpv
+        if rate - step <= -1:
+            # Overshot past -100%; move halfway towards it instead
+            step = (rate + 1) / 2
+        rate -= step
+        if abs(step) < tol:
+            return rate
+    return np.nan
+
+def annuity_irr(capital_investment, annual_cash_flow, project_lifetime):
+    """
+    Calculate the IRR of an investment that returns a constant annual cash flow.
+    
+    Solves capital_investment = annual_cash_flow * (1 - (1 + r)^-n) / r for r
+    with the compiled Newton kernel, falling back to a bracketed Brent root find
+    if Newton doesn't converge, instead of the polynomial solve in npf.irr.
+    
+    Args:
+        capital_investment (float): Initial capital investment ($)
+        annual_cash_flow (float): Cash flow received at the end of every year ($)
+        project_lifetime (int): Number of annual cash flows
+    
+    Returns:
+        float: IRR as a decimal, or nan if there is no IRR within IRR_BRACKET
+    """
+    if capital_investment <= 0 or annual_cash_flow <= 0:
+        return np.nan
+    if annual_cash_flow * project_lifetime == capital_investment:
+        return 0.0  # Undiscounted cash flows exactly repay the investment
+    
+    rate = _annuity_irr_newton(float(capital_investment), float(annual_cash_flow), int(project_lifetime), 1e-10, 50)
+    if not np.isnan(rate):
+        # The IRR is unique, so one outside the bracket can't be found by Brent either
+        return rate if IRR_BRACKET[0] <= rate <= IRR_BRACKET[1] else np.nan
+    
+    def npv_at(rate):
+        if abs(rate) < 1e-12:
+            # Limit of the annuity factor as the rate goes to zero
+            return annual_cash_flow * project_lifetime - capital_investment
+        return annual_cash_flow * (1 - (1 + rate) ** -project_lifetime) / rate - capital_investment
+    
+    try:
+        return brentq(npv_at, *IRR_BRACKET)
+    except ValueError:
+        # The NPV has the same sign at both ends of the bracket
+        return np.nan